@@ -1,170 +1,471 @@
-class Node:
-    def __init__(self, char):
-        """
-        Represents a node in the Trie. Each node stores an array of links. The size is constant at 26 for the 26 lowercase alphabets and + 1 for the terminal(at index 0)
-        :Input:
-            char: The character representing the node
-        :Time complexity: O(1)
-        :Aux space complexity: O(1)        
-        """
-        self.links = [None] * 27  # O(1) time and space since it is fixed at 27
-        self.char = char # the character at this node
-        self.word = None # to store a reference to a sentence in the terminal node
-
-        # the number of occurrences of a word. This is stored in every node so that we can compare the current inserted word's frequency with a node's current best word frequency
-        # it is updated conditionally with each insertion involving this node. Refer to update_nodes() method
-        self.word_freq = 0
-        # reference to the child node that should be used during the traversal in autocomplete.
-        # it is updated conditionally with each insertion involving this node. Refer to update_nodes() method 
-        self.best_child = None
-
-class CatsTrie:
-    def __init__(self, sentences):
-        """
-        Represents a Trie data structure
-        :Input:
-            sentences: The list of strings available to be chosen when trying to autocompleting a prompt
-        Note: M is the maximum length of a sentence in sentences and N is the number of sentences
-        :Time complexity: O(NM) because each creates maximum M aux space and this is done N times  
-        :Aux space complexity: O(NM) because each sentence uses maximum M aux space depending on length of sentence and this is done for N sentences
-      
-        """
-        self.root = Node('R') # root node
-        self.nodes_to_update = None # tracks the nodes that need to be updated for each string inserted
-        # O(NM) where N = len(sentences) and M is the number of characters in the longest sentence
-        for sentence in sentences: # N times
-            self.insert_iterative(sentence) # O(M)
-
-    def insert_iterative(self, sentence):
-        """
-        Iteratively inserts a node into the trie. It will only create a Node if the node does not previously exist. At the end of the insertion it calls update_nodes()
-        to update all the node's best_child node and also the word_freq. 
-
-        :Input: 
-            sentence: string to be inserted
-        :Postcondition: Each node points to the optimal child node for autocompleting
-        :Time complexity: O(M)
-        :Aux space complexity: O(M)   
-        
-        """
-        self.nodes_to_update = []
-        current_node = self.root
-
-        # O(M)
-        for char in sentence:
-            index = ord(char) - 97 + 1 # returning the unicode value of a singlle character is O(1)
-
-            # create node if it doesn't exist, O(1) 
-            if current_node.links[index] is None:
-                current_node.links[index] = Node(char)
-
-            self.nodes_to_update.append(current_node) # update the nodes_to_update
-            current_node = current_node.links[index] # move onto child node
-
-        self.nodes_to_update.append(current_node) # update the nodes_to_update with the last character's node (e.g. for sentence 'abc' the last char is 'c') 
-
-        # create terminal node if it does not exist, O(1)
-        if current_node.links[0] is None:
-            current_node.links[0] = Node('$')
-        
-        terminal_node = current_node.links[0]  # move onto terminal node
-        terminal_node.word_freq += 1 # increment this word's frequency
-        terminal_node.word = sentence # add a reference to the word in the terminal node, can be accessed during autocomplete
-        self.nodes_to_update.append(terminal_node) # update the nodes_to_update with this terminal node
-
-        # update all the nodes
-        self.update_nodes()
-
-    def update_nodes(self):
-        """
-        Initializes newly created nodes with their default child node, except for the terminal node
-        Updates the node's best child node based on the frequency, followed by lexicographical ordering. 
-        Example:
-            Scenario: The word "abc" is inserted, so each character's best_child is initialized: R->a, a->b, b->c; their word_freq is the frequency of the word "abc" which is 1
-                      The word "aba" is then inserted, since all the node's best_child frequencies are equal to the inserted word("aba")'s frequency, we look at lexicographical ordering.
-                        * Root node: R's best child is 'a' which is same as new child 'a' so do nothing
-                        * First char: 'a''s best child is 'b' which is same as new child 'b' so do nothing
-                        * Second char: 'b''s best child is 'c' which is less than new child 'c' so change 'b''s best child to new child
-                        * Third char: 'a''s best child is initialized and its word_freq = frequency of word "aba"(1)
-                      The word "abc" is inserted again, now frequency of "abc" is 2 which is greater than all of the node's best_child frequency
-                        * Root node: R's best child set to 'a'. No change to best_child, but R's word_freq is updated to 2
-                        * First char: 'a''s best child set to 'b'. No change to best_child, but 'a''s word_freq is updated to 2
-                        * Second char: 'c''s best child is set to '$'. No change to best_child, but 'c's word_freq is updated to 2
-                      The word "aba" is inserted again, now all the node's best child frequencies are equal to the inserted word's frequency(2). Look at lexicographical ordering
-                        * R, and a's best child and new child are the same so do nothing
-                        * b's best child is 'c' and new child 'a' is less than 'c' so update b's best child to 'a'
-        Note that since we are comparing a node with its child node in a for loop, updating the last node's word_freq has to be done separately outside the loop
-
-        Note: M is the maximum length of a sentence in sentences and N is the number of sentences
-        :Precondition: The word has been inserted into the Trie. 
-        :Time complexity: O(2M) = O(M)
-        :Aux space complexity: O(1)     
-        
-        """
-        # O(M) where M is the length of the word
-        # print(f"For {sentence} the first character changed is at index {self.firstCharChangedIndex}")
-        for i in range(len(self.nodes_to_update)-1):
-            node = self.nodes_to_update[i]
-            if node.best_child is None:
-                node.best_child = self.nodes_to_update[i+1]
-                node.word_freq = self.nodes_to_update[-1].word_freq
-            # print(f"{node.char}, current best child {node.best_child.char} current freq:{node.word_freq}, inserted word freq:{nodes_to_update[-1].word_freq} ")
-
-        inserted_word_freq = self.nodes_to_update[-1].word_freq # O(1)
-        # O(M) because the number of nodes to update is equal to the length of the word + 2 extra(1 for terminal 1 for root)
-        for i in range(len(self.nodes_to_update)-1):
-            node = self.nodes_to_update[i] # O(1)
-            new_child = self.nodes_to_update[i+1] # O(1)
-
-            # if new inserted word's frequency is greater than best child's word_freq, update the best child and word_freq of this node, O(1) operations
-            if inserted_word_freq > node.best_child.word_freq:
-                # print(f"New word {nodes_to_update[-1].word}({inserted_word_freq}) > {node.char}'s original best_child {node.best_child.char}'s freq of {node.best_child.word_freq}")
-                node.best_child = new_child
-                node.word_freq = inserted_word_freq
-
-            # if frequency is the same and new child is lexicographically smaller than old best child, update the best child of this node, comparing single character is O(1)
-            elif inserted_word_freq == node.best_child.word_freq and new_child.char < node.best_child.char:
-                # print(f"New word {nodes_to_update[-1].word} and {node.best_child.char} same frequency, and new child {new_child.char} < {node.best_child.char}")
-                node.best_child = new_child
-            
-        # update last node, O(1) operations
-        if inserted_word_freq > self.nodes_to_update[-2].word_freq:
-            # print(f"New word {nodes_to_update[-1].word}({inserted_word_freq}) > {nodes_to_update[-2].char}'s original best_child {nodes_to_update[-2].best_child.char}'s freq of {nodes_to_update[-2].best_child.word_freq}")
-            self.nodes_to_update[-2].word_freq = inserted_word_freq
-
-        # print("After update:")
-        # for i in range(len(self.nodes_to_update)-1):
-        #     node = self.nodes_to_update[i]
-            # print(f"{node.char}, current best child {node.best_child.char} current freq:{node.word_freq}, inserted word freq:{nodes_to_update[-1].word_freq} ")
-
-   
-    def autoComplete(self, prompt):
-        """
-        Returns the most frequent autocompleted sentence based on the prompt. Tie breaker is using lexicographical ordering.
-        This is done by traversing the Trie until the node of the last character of the prompt, and then continue traversing to reach the terminal where the word 
-        can be retrieved via a reference.
-        
-        :Input:
-            prompt: The prompt string to be autocompleted
-        :Return:
-            the most frequent autocompleted sentence, using lexicographical ordering as a tiebreaker if same frequency is encountered
-        :Time complexity: O(X+Y), but if the prompt is invalid it will be just O(X)
-        :Aux space complexity: O(1)           
-        
-        """
-        node = self.root # start at root
-
-        # iterate through prompt, O(X), where X is length of prompt. This always occurs
-        for char in prompt:
-            index = ord(char) - 97 + 1
-            # if the character in the prompt does not exist, no options, so return None. This means the complexity of the function is O(X)
-            if node.links[index] is None:
-                return None
-            node = node.links[index]
-
-        # traverse Trie by iterating through the best_child of the nodes until the terminal is reached, where the word can be retrieved 
-        # the part below is O(Y-X) where Y is the length of the autocompleted word
-        current = node.best_child
-        while current.char != '$':
-            current = current.best_child
-        return current.word
\ No newline at end of file
+from array import array
+from collections import Counter
+
+INITIAL_CAPACITY = 64 # number of node slots allocated up front, doubled whenever the arena is full
+MAX_FREQ = 2**63 - 1 # largest frequency a sentence can reach, word_freq is a signed 64-bit array
+COMPLETION_CACHE_SIZE = 4096 # number of most recently used prompts whose completions are remembered by autoComplete
+CHARS = b'$abcdefghijklmnopqrstuvwxyz' # the character of each character index, shared by every node instead of storing a string per node
+INDEX_TO_ASCII = bytes.maketrans(bytes(range(len(CHARS))), CHARS) # translation table from character indices to the bytes in CHARS
+
+
+def encode(text):
+    """
+    Encodes a sentence or prompt to the ASCII bytes that the Trie walks, checking every character once so that an invalid character is rejected
+    the same way wherever it would end up in the Trie, including inside a tail node.
+    :Input:
+        text: the string to be encoded
+    :Return:
+        the bytes of text
+    :Raises:
+        IndexError: if text has a character other than the lowercase alphabets
+    :Time complexity: O(M) where M is the length of text
+    :Aux space complexity: O(M)
+    """
+    encoded = text.encode('ascii', 'replace') # characters outside ASCII become '?', which is rejected below
+    if encoded.translate(None, CHARS[1:]): # deleting every lowercase alphabet leaves the invalid characters
+        raise IndexError(f"{text!r} has characters other than the lowercase alphabets")
+    return encoded
+
+
+class CatsTrie:
+    # fixed attribute layout, so instances have no __dict__ and every attribute is read from a fixed slot
+    __slots__ = ('capacity', 'n_nodes', 'bitmap', 'child_start', 'child_store', 'char_of', 'tails', 'word_freq', 'best_child',
+                 'completions', 'root', 'completion_cache', 'path', 'frozen', '__weakref__')
+
+    def __init__(self, sentences):
+        """
+        Represents a Trie data structure. Instead of a tree of Node objects, the nodes live in an arena: a set of parallel arrays indexed by node id.
+        A node can have 27 children, 26 for the lowercase alphabets and + 1 for the terminal(at index 0). Most nodes only have one or two, so instead of a row of 27 child ids
+        each node has a 27-bit bitmap of the children that exist, and the ids of those children are packed in index order into one shared child_store array.
+        The position of a child in the node's block is the number of bits set below its index in the bitmap.
+        A chain of nodes that only leads to one sentence is compressed into a single tail node: a leaf that stores the remaining characters of the sentence as bytes.
+        When another sentence diverges inside it, the characters they share are split back into normal nodes.
+        Repeats of a sentence are counted with a hash table first, so each distinct sentence is inserted once with its count.
+        The distinct sentences are inserted in sorted order so that consecutive insertions share their prefixes.
+        :Input:
+            sentences: The list of strings available to be chosen when trying to autocompleting a prompt
+        Note: M is the maximum length of a sentence in sentences and N is the number of sentences
+        :Time complexity: O(NM) to count the sentences, O(DM log D) to sort the D distinct sentences since comparing two sentences is O(M),
+                          followed by O(DM) because each insertion is O(M) and this is done D times
+        :Aux space complexity: O(NM) because each sentence uses maximum M aux space depending on length of sentence and this is done for N sentences
+
+        """
+        self.capacity = INITIAL_CAPACITY # number of node slots currently allocated
+        self.n_nodes = 0 # number of node slots in use, the next node created gets this id
+        self.bitmap = array('I', [0]) * self.capacity # bit i is set if the node has the child at index i
+        self.child_start = array('i', [0]) * self.capacity # offset of the node's block of child ids in child_store
+        self.child_store = array('i') # packed blocks of child ids, one block per node with children
+        self.char_of = array('B', [0]) * self.capacity # index of the character at each node, 1..26 for 'a'..'z' and 0 for the terminal
+        self.tails = [None] * self.capacity # characters after the node's own character for a tail node, None for every other node
+        # the characters reached by following a node's best_child chain, None until the node is autocompleted and again whenever an insertion may change its best_child chain.
+        # Only nodes with more than one child keep one, there are fewer of them than distinct sentences so the memo takes at most the space of the sentences themselves
+        self.completions = [None] * self.capacity
+
+        # the number of occurrences of a word. This is stored for every node so that we can compare the current inserted word's frequency with a node's current best word frequency
+        # it is updated conditionally with each insertion involving this node. Refer to insert_iterative() method
+        self.word_freq = array('q', [0]) * self.capacity
+        # id of the child node that should be used during the traversal in autocomplete, 0 if not set yet.
+        # it is updated conditionally with each insertion involving this node. Refer to insert_iterative() method
+        self.best_child = array('i', [0]) * self.capacity
+
+        # node 0 is a null node that is never linked into the Trie, so a node id of 0 can mean "no node" and every array starts zero-filled
+        self.new_node(0)
+        self.root = self.new_node(0) # root node, its character is never read
+        # remembers the completions of recent prompts in least to most recently used order, it is cleared whenever a sentence is inserted since that can change any completion.
+        # A plain dict filled by autoComplete() is used instead of functools.lru_cache, which would have to wrap a bound method and make a reference cycle with the Trie
+        self.completion_cache = {}
+        self.frozen = False # set on the compacted copy returned by freeze(), which cannot be inserted into
+        self.path = [0] * 32 # scratch for the ids of the nodes on an inserted sentence's path, overwritten by every insertion and grown for longer sentences
+        # O(NM) where N = len(sentences) and M is the number of characters in the longest sentence
+        counts = Counter(sentences) # O(NM) to hash the sentences
+        for sentence in sorted(counts): # D times, once per distinct sentence
+            self.insert_iterative(sentence, counts[sentence]) # O(M)
+
+    def new_node(self, char_idx):
+        """
+        Allocates the next free node slot in the arena, doubling the capacity of every array if the arena is full.
+        :Input:
+            char_idx: The index of the character representing the node, 0 for the terminal
+        :Return:
+            the id of the new node
+        :Time complexity: O(1) amortized, since the arrays are only doubled after capacity insertions
+        :Aux space complexity: O(1) amortized
+        """
+        node_id = self.n_nodes
+        capacity = self.capacity
+        if node_id == capacity:
+            # extend in place so the arrays keep their identity, O(capacity)
+            self.bitmap.extend(array('I', [0]) * capacity)
+            self.child_start.extend(array('i', [0]) * capacity)
+            self.char_of.extend(array('B', [0]) * capacity)
+            self.tails.extend([None] * capacity)
+            self.completions.extend([None] * capacity)
+            self.word_freq.extend(array('q', [0]) * capacity)
+            self.best_child.extend(array('i', [0]) * capacity)
+            self.capacity = capacity * 2
+
+        self.char_of[node_id] = char_idx
+        self.n_nodes = node_id + 1
+        return node_id
+
+    def add_child(self, node, index):
+        """
+        Creates a new node as the child of node at index and inserts its id into node's block in child_store.
+        If the block is at the end of child_store it grows in place, otherwise it is copied to the end together with the new child id, and the old block is left unused.
+        :Input:
+            node: id of the parent node
+            index: index of the new child, 1..26 for 'a'..'z' and 0 for the terminal
+        :Return:
+            the id of the new child node
+        :Time complexity: O(1), a block holds at most 27 child ids
+        :Aux space complexity: O(1)
+        """
+        child_store = self.child_store
+        child_start = self.child_start
+        child = self.new_node(index)
+        bits = self.bitmap[node]
+        start = child_start[node]
+        end = start + bits.bit_count() # end of the block, one past the last child id
+        pos = start + (bits & ((1 << index) - 1)).bit_count() # position of the new child, keeping the block in index order
+
+        if end == len(child_store): # the block is the last one, grow it in place
+            child_store.insert(pos, child)
+        else: # move the block to the end of child_store
+            child_start[node] = len(child_store)
+            child_store.extend(child_store[start:pos])
+            child_store.append(child)
+            child_store.extend(child_store[pos:end])
+
+        self.bitmap[node] = bits | (1 << index)
+        return child
+
+    def expand_tail(self, node, shared):
+        """
+        Turns a tail node into a chain of normal nodes for the first shared characters of its tail, followed by a child that holds the rest of its sentence:
+        a tail node for the remaining characters, or a terminal node if there are none. Every node in the chain has one child, so it becomes its best_child.
+        The whole shared part is expanded at once, so the tail is only sliced once however deep the next sentence diverges from it.
+        :Input:
+            node: id of the tail node
+            shared: number of characters at the start of the tail that are shared with the sentence being inserted, at most the length of the tail
+        :Time complexity: O(M)
+        :Aux space complexity: O(M)
+        """
+        tails = self.tails
+        word_freq = self.word_freq
+        best_child = self.best_child
+        tail = tails[node]
+        tails[node] = None
+        freq = word_freq[node] # every node of the chain leads to the same sentence, so they all take over its frequency
+
+        for k in range(shared):
+            child = self.add_child(node, tail[k] - 96)
+            word_freq[child] = freq
+            best_child[node] = child
+            node = child
+
+        if shared < len(tail):
+            child = self.add_child(node, tail[shared] - 96)
+            tails[child] = tail[shared+1:]
+        else:
+            child = self.add_child(node, 0)
+        word_freq[child] = freq
+        best_child[node] = child
+
+    def insert_iterative(self, sentence, times=1):
+        """
+        Iteratively inserts a node into the trie. It will only create a node if the node does not previously exist, and the first new node holds the rest of the sentence as a tail node.
+        A tail node on the way that does not hold exactly the rest of the sentence is expanded. While descending it records the path of node ids,
+        then it ascends the path to update each node's best_child and word_freq, stopping at the first node whose word_freq is greater than the inserted word's frequency.
+        A node's word_freq is always the frequency of the word reached by following its best_child, so the inserted word's frequency only has to be compared with the node's own word_freq.
+        Newly created nodes have a word_freq of 0, so they are always initialized with the new child as their best_child.
+        Example:
+            Scenario: The word "abc" is inserted, so each character's best_child is initialized: R->a, a->b, b->c, c->$; their word_freq is the frequency of the word "abc" which is 1
+                      The word "aba" is then inserted, since all the node's word_freq are equal to the inserted word("aba")'s frequency, we look at lexicographical ordering.
+                        * Third char: 'a''s best child is initialized to '$' and its word_freq = frequency of word "aba"(1)
+                        * Second char: 'b''s best child is 'c' and new child 'a' is less than 'c' so change 'b''s best child to new child
+                        * First char: 'a''s best child is 'b' which is same as new child 'b' so do nothing
+                        * Root node: R's best child is 'a' which is same as new child 'a' so do nothing
+                      The word "abc" is inserted again, now frequency of "abc" is 2 which is greater than all of the node's word_freq
+                        * Third char: 'c''s best child set to '$'. No change to best_child, but 'c''s word_freq is updated to 2
+                        * Second char: 'b''s best child set to 'c' and its word_freq is updated to 2
+                        * R and 'a''s best child set to the same child, but their word_freq is updated to 2
+                      The word "aba" is inserted again, now all the node's word_freq are equal to the inserted word's frequency(2). Look at lexicographical ordering
+                        * b's best child is 'c' and new child 'a' is less than 'c' so update b's best child to 'a'
+                        * R, and a's best child and new child are the same so do nothing
+
+        :Input:
+            sentence: string to be inserted, made of lowercase alphabets only, otherwise IndexError is raised
+            times: number of times the sentence is inserted, it is added to the sentence's frequency in one go. It has to be at least 1, otherwise ValueError is raised
+        :Postcondition: Each node points to the optimal child node for autocompleting
+        :Time complexity: O(2M) = O(M), the ascent is often shorter since it stops at the first node with a more frequent word
+        :Aux space complexity: O(1) amortized, the path scratch only grows when a sentence is longer than every sentence before it
+
+        """
+        if self.frozen:
+            raise RuntimeError("cannot insert into a frozen CatsTrie, its nodes are shared between sentences")
+        # a frequency that does not grow would break the invariant that a node's word_freq is never less than its descendants'
+        if times < 1:
+            raise ValueError(f"times must be at least 1, got {times}")
+        encoded = encode(sentence)
+        # the root's word_freq is the highest frequency in the Trie, so the sentence can only overflow when that is close to MAX_FREQ.
+        # Only then is its current frequency looked up, so that an insertion that fails leaves the Trie unchanged
+        if times > MAX_FREQ - self.word_freq[self.root] and times > MAX_FREQ - self.frequency(encoded):
+            raise OverflowError(f"the frequency of {sentence!r} would exceed {MAX_FREQ}")
+        self.completion_cache.clear() # O(1) when the cache is empty, which it is for every insertion while constructing the trie
+
+        # bind the arena to locals so the loop does not look up attributes on every character
+        bitmap = self.bitmap
+        child_start = self.child_start
+        child_store = self.child_store
+        word_freq = self.word_freq
+        best_child = self.best_child
+        char_of = self.char_of
+        completions = self.completions
+        path = self.path # ids of the nodes from the root to the terminal of this sentence
+        if len(path) < len(sentence) + 2: # + 2 for the root and the terminal
+            path.extend([0] * (len(sentence) + 2 - len(path)))
+        current_node = path[0] = self.root
+        depth = 0 # position of current_node in path
+
+        tails = self.tails
+        leaf = 0 # node holding this sentence, found or created below
+
+        # O(M), indexing the encoded sentence yields the byte of each character so no ord() call is needed
+        for i in range(len(encoded)):
+            index = encoded[i] - 96 # 'a' is 97
+            bits = bitmap[current_node]
+
+            # no child for this character, the rest of the sentence is stored in one new tail node instead of a chain of nodes, O(M)
+            if not bits >> index & 1:
+                leaf = self.add_child(current_node, index)
+                tails[leaf] = encoded[i+1:]
+                depth += 1
+                path[depth] = leaf
+                break
+
+            current_node = child_store[child_start[current_node] + (bits & ((1 << index) - 1)).bit_count()] # move onto child node, O(1)
+            depth += 1
+            path[depth] = current_node
+
+            tail = tails[current_node]
+            if tail is not None:
+                # the tail node already holds this sentence
+                if len(tail) == len(encoded) - i - 1 and encoded.endswith(tail):
+                    leaf = current_node
+                    break
+                # the sentences diverge inside the tail, so expand the characters they share into normal nodes and keep descending through them, O(M)
+                shared = 0
+                while shared < len(tail) and i + 1 + shared < len(encoded) and tail[shared] == encoded[i+1+shared]:
+                    shared += 1
+                self.expand_tail(current_node, shared)
+
+        if not leaf:
+            # move onto terminal node, creating it if it doesn't exist, O(1). The terminal is always first in the block
+            if bitmap[current_node] & 1:
+                leaf = child_store[child_start[current_node]]
+            else:
+                leaf = self.add_child(current_node, 0)
+            depth += 1
+            path[depth] = leaf
+
+        word_freq[leaf] += times # increment this word's frequency
+        inserted_word_freq = word_freq[leaf] # O(1)
+
+        # ascend from the last character's node to the root, O(M)
+        for i in range(depth - 1, -1, -1):
+            node = path[i] # O(1)
+            node_freq = word_freq[node] # O(1)
+
+            # if new inserted word's frequency is greater than the node's word_freq, update the best child and word_freq of this node, O(1) operations
+            if inserted_word_freq > node_freq:
+                best_child[node] = path[i+1]
+                word_freq[node] = inserted_word_freq
+
+            # a node's word_freq is never less than its descendants', so every remaining ancestor also has a greater word_freq and keeps its best child.
+            # This is checked before the tie since ties are the rarest case
+            elif inserted_word_freq < node_freq:
+                break
+
+            # if frequency is the same and new child is lexicographically smaller than old best child, update the best child of this node, comparing character indices is O(1)
+            elif char_of[path[i+1]] < char_of[best_child[node]]:
+                best_child[node] = path[i+1]
+
+            # the best_child chain of this node may now lead to a different word or go through a node whose chain did, O(1)
+            completions[node] = None
+
+    def frequency(self, encoded):
+        """
+        Returns the number of times a sentence has been inserted, without changing the Trie.
+        :Input:
+            encoded: the sentence encoded by encode()
+        :Return:
+            the frequency of the sentence, 0 if it has not been inserted
+        :Time complexity: O(M)
+        :Aux space complexity: O(M) to slice the rest of the sentence at a tail node
+        """
+        bitmap = self.bitmap
+        node = self.root
+        for i in range(len(encoded)):
+            index = encoded[i] - 96 # 'a' is 97
+            bits = bitmap[node]
+            if not bits >> index & 1:
+                return 0
+            node = self.child_store[self.child_start[node] + (bits & ((1 << index) - 1)).bit_count()]
+            if self.tails[node] is not None: # a tail node holds exactly one sentence
+                return self.word_freq[node] if self.tails[node] == encoded[i+1:] else 0
+
+        # the sentence ends at this node, its frequency is kept by the terminal, which is always first in the block
+        return self.word_freq[self.child_store[self.child_start[node]]] if bitmap[node] & 1 else 0
+
+    def freeze(self):
+        """
+        Returns a compacted read-only copy of the Trie for when no more sentences will be inserted. Subtries with the same structure are merged into one (a DAFSA),
+        which mostly shares the suffixes of the sentences. Two nodes are merged when they have the same character, word_freq and tail, and the same children and best_child
+        after merging. Since no node stores its sentence, merged nodes still complete every prompt the same way. The copy's child blocks are also packed without any unused space.
+        The nodes are merged bottom-up, visiting every child before its parent.
+
+        :Return:
+            a new CatsTrie with the merged nodes, insert_iterative() raises RuntimeError on it
+        :Time complexity: O(T) where T is the number of nodes
+        :Aux space complexity: O(T)
+
+        """
+        bitmap = self.bitmap
+        child_start = self.child_start
+        child_store = self.child_store
+        best_child = self.best_child
+        char_of = self.char_of
+        tails = self.tails
+        word_freq = self.word_freq
+
+        frozen = CatsTrie([])
+        merged = [0] * self.n_nodes # id of each node in frozen
+        canonical = {} # the id in frozen of every distinct node, keyed by its signature
+
+        # nodes in preorder, so reversing it visits every child before its parent, O(T)
+        order = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            start = child_start[node]
+            stack.extend(child_store[start:start + bitmap[node].bit_count()])
+
+        for node in reversed(order): # O(T)
+            start = child_start[node]
+            children = tuple(merged[child] for child in child_store[start:start + bitmap[node].bit_count()])
+            signature = (char_of[node], word_freq[node], tails[node], merged[best_child[node]], children)
+
+            if node == self.root:
+                new_id = frozen.root
+            elif signature in canonical:
+                merged[node] = canonical[signature]
+                continue
+            else:
+                new_id = canonical[signature] = frozen.new_node(char_of[node])
+
+            merged[node] = new_id
+            frozen.bitmap[new_id] = bitmap[node]
+            frozen.child_start[new_id] = len(frozen.child_store)
+            frozen.child_store.extend(children)
+            frozen.tails[new_id] = tails[node]
+            frozen.word_freq[new_id] = word_freq[node]
+            frozen.best_child[new_id] = merged[best_child[node]]
+
+        frozen.frozen = True
+        return frozen
+
+    def autoComplete(self, prompt):
+        """
+        Returns the most frequent autocompleted sentence based on the prompt. Tie breaker is using lexicographical ordering.
+        Repeated prompts are answered from completion_cache, other prompts are looked up in the Trie by find_completion().
+
+        :Input:
+            prompt: The prompt string to be autocompleted, made of lowercase alphabets only, otherwise IndexError is raised
+        :Return:
+            the most frequent autocompleted sentence, using lexicographical ordering as a tiebreaker if same frequency is encountered
+        :Time complexity: O(X) if the prompt is cached, otherwise O(X+Y)
+        :Aux space complexity: O(Y) to keep the completion in completion_cache, which holds at most COMPLETION_CACHE_SIZE completions
+
+        """
+        cache = self.completion_cache
+        if prompt in cache:
+            completion = cache.pop(prompt) # reinserted below to mark it as the most recently used
+        else:
+            completion = self.find_completion(prompt)
+            if len(cache) >= COMPLETION_CACHE_SIZE:
+                del cache[next(iter(cache))] # evict the least recently used prompt, O(1)
+        cache[prompt] = completion
+        return completion
+
+    def find_completion(self, prompt):
+        """
+        Returns the most frequent autocompleted sentence based on the prompt. Tie breaker is using lexicographical ordering.
+        This is done by traversing the Trie until the node of the last character of the prompt, and then continue traversing to reach the terminal or tail node.
+        The sentence is not stored in the Trie, it is rebuilt from the prompt and the characters of the nodes traversed after it, followed by the tail of a tail node.
+        The characters after the prompt are memoized in completions for nodes with more than one child, so the traversal after the prompt stops at the first such node
+        that has been autocompleted before, until an insertion changes it. Nodes with one child are not memoized, otherwise a long chain of them would keep a
+        suffix per node, O(Y^2) characters in total.
+
+        :Input:
+            prompt: The prompt string to be autocompleted, made of lowercase alphabets only, otherwise IndexError is raised
+        :Return:
+            the most frequent autocompleted sentence, using lexicographical ordering as a tiebreaker if same frequency is encountered
+        :Time complexity: O(X+Y), but if the prompt is invalid or the completion of the prompt's node is memoized it will be just O(X)
+        :Aux space complexity: O(Y) for the rebuilt sentence, plus O(Y) for its memo if the prompt's node has more than one child
+
+        """
+        bitmap = self.bitmap
+        child_start = self.child_start
+        child_store = self.child_store
+        best_child = self.best_child
+        char_of = self.char_of
+        tails = self.tails
+        completions = self.completions
+        node = self.root # start at root
+
+        # an empty Trie has no sentences to complete with
+        if not bitmap[node]:
+            return None
+
+        encoded = encode(prompt)
+        # iterate through the bytes of the prompt, O(X), where X is length of prompt. This always occurs
+        for i in range(len(encoded)):
+            index = encoded[i] - 96 # 'a' is 97
+            bits = bitmap[node]
+            # if the character in the prompt does not exist, no options, so return None. This means the complexity of the function is O(X)
+            if not bits >> index & 1:
+                return None
+            node = child_store[child_start[node] + (bits & ((1 << index) - 1)).bit_count()]
+
+            # a tail node holds the only sentence below it, which is the completion if the rest of the prompt is a prefix of its tail
+            if tails[node] is not None:
+                return prompt[:i+1] + tails[node].decode('ascii') if tails[node].startswith(encoded[i+1:]) else None
+
+        completion = completions[node]
+        if completion is not None:
+            return prompt + completion
+
+        # traverse Trie by iterating through the best_child of the nodes until a node without children is reached, which is a terminal node or a tail node,
+        # or a node whose completion is memoized, collecting the characters of the word on the way. The part below is O(Y-X) where Y is the length of the autocompleted word
+        suffix = bytearray() # character indices of the nodes after the prompt
+        append = suffix.append
+        rest = '' # memoized completion of the node the traversal stopped at
+        current = node
+        while bitmap[current]:
+            current = best_child[current]
+            append(char_of[current])
+            if completions[current] is not None:
+                rest = completions[current]
+                break
+
+        # translate the indices to characters in one go, deleting the terminal's index 0 since it is not part of the sentence
+        suffix = suffix.translate(INDEX_TO_ASCII, b'\0')
+        if tails[current]: # only a node without children has a tail, so it is never a memoized node
+            suffix += tails[current]
+        completion = suffix.decode('ascii') + rest
+
+        bits = bitmap[node]
+        if bits & (bits - 1): # more than one child
+            completions[node] = completion
+        return prompt + completion
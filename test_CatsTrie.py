@@ -0,0 +1,121 @@
+import random
+import unittest
+from collections import Counter
+
+from CatsTrie import CatsTrie
+
+
+def brute_force(counts, prompt):
+    """
+    Returns the most frequent sentence in counts that starts with prompt, using lexicographical ordering as a tiebreaker, or None if there is none.
+    """
+    candidates = [(-freq, sentence) for sentence, freq in counts.items() if sentence.startswith(prompt)]
+    return min(candidates)[1] if candidates else None
+
+
+class TestCatsTrie(unittest.TestCase):
+    def test_most_frequent_then_lexicographical(self):
+        trie = CatsTrie(['abc', 'abazacy', 'dbcef', 'xzz', 'gdbc', 'abazacy', 'xyz', 'abazacy', 'dbcef', 'xyz', 'xxx', 'xzz'])
+        self.assertEqual(trie.autoComplete('ab'), 'abazacy')
+        self.assertEqual(trie.autoComplete('a'), 'abazacy')
+        self.assertEqual(trie.autoComplete('dbcef'), 'dbcef')
+        self.assertEqual(trie.autoComplete('dbcefz'), None)
+        self.assertEqual(trie.autoComplete('ba'), None)
+        self.assertEqual(trie.autoComplete('x'), 'xyz')
+        self.assertEqual(trie.autoComplete(''), 'abazacy')
+
+    def test_empty_trie(self):
+        self.assertIsNone(CatsTrie([]).autoComplete(''))
+
+    def test_insert_times(self):
+        trie = CatsTrie(['ab', 'ac'])
+        trie.insert_iterative('ac', times=3)
+        self.assertEqual(trie.autoComplete('a'), 'ac')
+        trie.insert_iterative('ab', times=3)
+        self.assertEqual(trie.autoComplete('a'), 'ab') # 4 each, 'ab' wins the tie
+
+    def test_insert_times_must_be_positive(self):
+        for times in (0, -1):
+            trie = CatsTrie(['ab'])
+            with self.assertRaises(ValueError):
+                trie.insert_iterative('cd', times)
+            # the failed insertion leaves no trace
+            self.assertEqual(trie.n_nodes, CatsTrie(['ab']).n_nodes)
+            self.assertIsNone(trie.autoComplete('c'))
+        trie = CatsTrie([])
+        with self.assertRaises(ValueError):
+            trie.insert_iterative('cd', 0)
+        self.assertIsNone(trie.autoComplete(''))
+
+    def test_frequency_overflow(self):
+        from CatsTrie import MAX_FREQ
+        trie = CatsTrie(['ab'])
+        trie.insert_iterative('zz', MAX_FREQ - 1)
+        self.assertEqual(trie.autoComplete(''), 'zz')
+        nodes = trie.n_nodes
+        with self.assertRaises(OverflowError):
+            trie.insert_iterative('zz', 2)
+        with self.assertRaises(OverflowError):
+            trie.insert_iterative('zy', MAX_FREQ + 1)
+        # the failed insertions leave no trace
+        self.assertEqual(trie.n_nodes, nodes)
+        self.assertEqual(trie.autoComplete('zz'), 'zz')
+        self.assertEqual(trie.autoComplete('a'), 'ab')
+        trie.insert_iterative('zz') # reaches MAX_FREQ exactly
+        trie.insert_iterative('zy', 2**31) # the baseline allowed frequencies beyond 32 bits
+        self.assertEqual(trie.autoComplete('z'), 'zz')
+
+    def test_tail_expansion(self):
+        trie = CatsTrie(['abcdef'])
+        self.assertEqual(trie.autoComplete('abcd'), 'abcdef')
+        self.assertIsNone(trie.autoComplete('abcx'))
+        # diverges inside the tail, then ends inside it, then extends it
+        trie.insert_iterative('abcxyz', times=2)
+        trie.insert_iterative('abc')
+        trie.insert_iterative('abcdefgh')
+        self.assertEqual(trie.autoComplete('abcd'), 'abcdef')
+        self.assertEqual(trie.autoComplete('abc'), 'abcxyz')
+        self.assertEqual(trie.autoComplete('abcdefg'), 'abcdefgh')
+        self.assertEqual(trie.autoComplete('ab'), 'abcxyz')
+
+    def test_completions_memo_on_branching_nodes_only(self):
+        trie = CatsTrie(['a' * 200, 'a' * 199 + 'b', 'a' * 100 + 'c'])
+        for i in range(201):
+            self.assertEqual(trie.autoComplete('a' * i), 'a' * 200)
+        # only the two nodes with more than one child keep a memo, not every node of the chain
+        self.assertEqual(sum(completion is not None for completion in trie.completions), 2)
+        trie.insert_iterative('a' * 100 + 'c', times=2) # invalidates the memo on its path
+        self.assertEqual(trie.autoComplete('a' * 50), 'a' * 100 + 'c')
+        self.assertEqual(trie.autoComplete('a' * 101), 'a' * 200)
+
+    def test_invalid_characters(self):
+        for sentences in (['aA'], ['aA', 'aB'], ['a{'], ['aé']):
+            with self.assertRaises(IndexError):
+                CatsTrie(sentences)
+        with self.assertRaises(IndexError):
+            CatsTrie(['abc']).autoComplete('aB')
+
+    def test_freeze_matches_original(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            sentences = [''.join(rng.choice('abc') for _ in range(rng.randint(0, 6))) for _ in range(rng.randint(1, 30))]
+            trie = CatsTrie(sentences)
+            frozen = trie.freeze()
+            self.assertLessEqual(frozen.n_nodes, trie.n_nodes)
+            counts = Counter(sentences)
+            prompts = {sentence[:i] for sentence in sentences for i in range(len(sentence) + 1)} | {'ca', 'abcabca'}
+            for prompt in prompts:
+                self.assertEqual(frozen.autoComplete(prompt), trie.autoComplete(prompt))
+                self.assertEqual(frozen.autoComplete(prompt), brute_force(counts, prompt))
+
+    def test_freeze_rejects_insert(self):
+        trie = CatsTrie(['abc', 'xbc'])
+        frozen = trie.freeze()
+        with self.assertRaises(RuntimeError):
+            frozen.insert_iterative('abd')
+        trie.insert_iterative('abd') # the original can still be inserted into
+        self.assertEqual(trie.autoComplete('abd'), 'abd')
+
+
+if __name__ == '__main__':
+    unittest.main()